@@ -1,24 +1,20 @@
 from .helper_types import *
 
+# Tokens that end an expression without being part of it
+_TERMINATORS = frozenset(
+    ("RPAR", "RBRACE", "BLOCKEND", "NEWLINE", "EOF", "COMMA", "COLON")
+)
+
 
 class ExprParser:
     def __init__(self, parser):
         self.parser = parser
-        self.rules = [
-            Rule("PLUS", Precedence.Term, infix=self.binary),
-            Rule("MINUS", Precedence.Term, prefix=self.unary, infix=self.binary),
-            Rule("MULTIPLY", Precedence.Factor, infix=self.binary),
-            Rule("DIVIDE", Precedence.Factor, infix=self.binary),
-            Rule("EQUALS", Precedence.Assignment, infix=self.binary),
-            Rule("NE", Precedence.Zero, prefix=self.unary),
-            Rule("INT", Precedence.Zero, prefix=self.number),
-            Rule("FLOAT", Precedence.Zero, prefix=self.number),
-            Rule("ID", Precedence.Zero, prefix=self.identifier),
-            Rule("LPAR", Precedence.Zero, prefix=self.paren),
-        ]
 
     def rule(self, tok_type):
-        return next(filter(lambda x: x.type == tok_type, self.rules))
+        try:
+            return self.rules[tok_type]
+        except KeyError:
+            raise SyntaxError(f"Unexpected token {tok_type}.") from None
 
     def paren(self):
         expr = self.parse()
@@ -32,29 +28,51 @@ class ExprParser:
         return TreeNode(NodeType.Literal, self.parser.prev)
 
     def unary(self):
-        node = TreeNode(NodeType.Operator, self.parser.prev)
-        node.children.append(self.parse(precedence=Precedence.Unary))
-        return node
+        op = self.parser.prev
+        return TreeNode(
+            NodeType.Operator, op, [self.parse(precedence=Precedence.Unary)]
+        )
 
-    def binary(self, left):
-        node = TreeNode(NodeType.Operator, self.parser.prev)
-        rule = self.rule(node.tok.type)
-        node.children.extend([left, self.parse(precedence=rule.precedence + 1)])
-        return node
+    def binary(self, left, precedence):
+        op = self.parser.prev
+        right = self.parse(precedence=precedence + 1)
+        return TreeNode(NodeType.Operator, op, [left, right])
 
     def parse(self, precedence=Precedence.Assignment):
-        prefix = self.rule(self.parser.consume().type).prefix
+        parser = self.parser
+        prefix = self.rule(parser.consume().type).prefix
 
         if not prefix:
             raise Exception("Expected expression.")
 
-        expr = prefix()
+        expr = prefix(self)
+        tok_type = parser.cur.type
+
+        while tok_type not in _TERMINATORS:
+            rule = self.rule(tok_type)
+            if rule.precedence < precedence:
+                break
 
-        while (
-            self.parser.cur.type not in ["RPAR", "NEWLINE", "COMMA", "COLON"]
-            and self.rule(self.parser.cur.type).precedence >= precedence
-        ):
-            infix = self.rule(self.parser.consume().type).infix
-            expr = infix(expr)
+            parser.consume()
+            expr = rule.infix(self, expr, rule.precedence)
+            tok_type = parser.cur.type
 
         return expr
+
+    # Handlers are stored unbound and called with the parser instance, so the
+    # table is built once for the class rather than for every ExprParser
+    rules = {
+        rule.type: rule
+        for rule in (
+            Rule("PLUS", Precedence.Term, infix=binary),
+            Rule("MINUS", Precedence.Term, prefix=unary, infix=binary),
+            Rule("MULTIPLY", Precedence.Factor, infix=binary),
+            Rule("DIVIDE", Precedence.Factor, infix=binary),
+            Rule("EQUALS", Precedence.Assignment, infix=binary),
+            Rule("NE", Precedence.Zero, prefix=unary),
+            Rule("INT", Precedence.Zero, prefix=number),
+            Rule("FLOAT", Precedence.Zero, prefix=number),
+            Rule("ID", Precedence.Zero, prefix=identifier),
+            Rule("LPAR", Precedence.Zero, prefix=paren),
+        )
+    }
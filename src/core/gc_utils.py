@@ -0,0 +1,15 @@
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def gc_paused():
+    # Lexing and parsing allocate long-lived acyclic objects in bulk; cyclic
+    # GC passes over them while they are being built can never free anything
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
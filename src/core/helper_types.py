@@ -1,10 +1,13 @@
-from enum import Enum
-from typing import Any
-from ply.lex import Token
-from dataclasses import dataclass, field
+from __future__ import annotations
+from enum import IntEnum
+from typing import TYPE_CHECKING
+from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from ply.lex import Token
 
-class NodeType(Enum):
+
+class NodeType(IntEnum):
     CompilationUnit = 0
     Block = 1
     Statement = 2
@@ -21,8 +24,7 @@ class NodeType(Enum):
         return self._name_
 
 
-@dataclass(frozen=True)
-class Precedence:
+class Precedence(IntEnum):
     Zero = 0
     Assignment = 1
     Term = 2
@@ -30,19 +32,37 @@ class Precedence:
     Unary = 4
 
 
-@dataclass
+# Shared children of childless nodes, replaced by a list on the first add()
+_EMPTY = ()
+
+
 class TreeNode:
-    type: NodeType
-    tok: Token = None
-    children: list = field(default_factory=list)
+    __slots__ = ("type", "tok", "children")
+
+    def __init__(self, type: NodeType, tok: Token = None, children: list = _EMPTY):
+        self.type = type
+        self.tok = tok
+        # Kept as given and later extended by add(), so it must be a list
+        self.children = children
+
+    def add(self, *children):
+        if self.children is _EMPTY:
+            self.children = list(children)
+        else:
+            self.children.extend(children)
 
     def __str__(self):
-        return f"{self.type}" + (f"[{self.tok.value}]" if self.tok else "")
+        name = self.type._name_
+        return f"{name}[{self.tok.value}]" if self.tok else name
 
     def print(self, level=0):
-        print("\t" * level + str(self))
-        for child in self.children:
-            child.print(level + 1)
+        lines = []
+        stack = [(self, level)]
+        while stack:
+            node, level = stack.pop()
+            lines.append("\t" * level + str(node))
+            stack.extend((child, level + 1) for child in reversed(node.children))
+        print("\n".join(lines))
 
 
 @dataclass(frozen=True)
@@ -46,7 +46,6 @@ tokens = (
     "PIPE",
     "COLON",  # :
     "COMMENT",  # //
-    "WS",  # Whitespaces
     "NEWLINE",  # \n
     "INDENT",   # + Indent
     "DEDENT",   # - Indent
@@ -90,7 +89,7 @@ def t_ID(t):
 
 
 # Data Types
-t_STR = r'"([^"\n]|(\\"))*"'
+t_STR = r'"(?:[^"\\\n]|\\.)*"'
 
 
 def t_FLOAT(t):
@@ -120,10 +119,8 @@ def t_RPAR(t):
 
 
 # Misc
-def t_WS(t):
-    r"[ ]+"
-    if t.lexer.at_line_start and t.lexer.paren_count == 0:
-        return t
+# Indentation is measured from token positions, so spaces are never tokens
+t_ignore = " "
 
 
 def t_newline(t):
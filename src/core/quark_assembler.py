@@ -1,9 +1,10 @@
 import subprocess
+from pathlib import Path
 
 
 class QuarkAssembler:
     def assemble(self, asm_path, out_path=""):
-        self.filename = asm_path[asm_path.rfind("/") + 1 : asm_path.rfind(".")]
+        self.filename = Path(asm_path).stem
         result = subprocess.run(
             [
                 "nasm",
@@ -1,9 +1,24 @@
+from functools import lru_cache
 from ply import lex
+from . import lex_grammar
+from .gc_utils import gc_paused
+
+
+@lru_cache(maxsize=None)
+def _master_lexer():
+    return lex.lex(module=lex_grammar)
+
+
+def build_lexer():
+    # Compiling the master regex is the expensive part of lex.lex(), so it is
+    # done once per process and every caller gets a clone that shares it
+    return _master_lexer().clone()
 
 
 class QuarkLexer:
-    def __init__(self, ply_lexer):
-        self.lexer = ply_lexer
+    def __init__(self, ply_lexer=None):
+        self.lexer = build_lexer() if ply_lexer is None else ply_lexer
+        self.tokens = None
         self.token_stream = None
 
     def _new_token(self, type, lineno, pos):
@@ -11,83 +26,56 @@ class QuarkLexer:
         tok.type, tok.value, tok.lineno, tok.pos = type, None, lineno, pos
         return tok
 
-    def _track_tokens_filter(self, tokens):
+    def _line_depth(self, token):
+        # Leading spaces are ignored by the lexer, so a token's indentation
+        # is the run of spaces its line starts with. Anything else before the
+        # token (e.g. a character t_error skipped) does not count.
+        lexdata = self.lexer.lexdata
+        start = lexdata.rfind("\n", 0, token.pos) + 1
+        line = lexdata[start : token.pos]
+        return len(line) - len(line.lstrip(" "))
+
+    def _build_tokens(self, add_endmarker=True):
         NO_INDENT, MAY_INDENT, MUST_INDENT = 0, 1, 2
-        self.lexer.at_line_start = at_line_start = True
+        tokens = []
+        # A stack of indentation levels; will never pop item 0
+        levels = [0]
+        at_line_start = True
         indent = NO_INDENT
-        saw_colon = False
-        for token in tokens:
-            token.at_line_start = at_line_start
-
-            if token.type == "COLON":
-                at_line_start = False
-                indent = MAY_INDENT
-                token.must_indent = False
+        token = None
+        for token in iter(self.lexer.token, None):
+            line_start = at_line_start
 
-            elif token.type == "NEWLINE":
+            if token.type == "NEWLINE":
                 at_line_start = True
                 if indent == MAY_INDENT:
                     indent = MUST_INDENT
-                token.must_indent = False
-
-            elif token.type == "WS":
-                assert token.at_line_start == True
-                at_line_start = True
-                token.must_indent = False
+                if not line_start:
+                    # blank lines are dropped, the rest pass on through
+                    tokens.append(token)
+                continue
 
+            if token.type == "COLON":
+                must_indent = False
+                indent = MAY_INDENT
             else:
                 # A real token; only indent after COLON NEWLINE
-                if indent == MUST_INDENT:
-                    token.must_indent = True
-                else:
-                    token.must_indent = False
-                at_line_start = False
+                must_indent = indent == MUST_INDENT
                 indent = NO_INDENT
+            at_line_start = False
 
-            yield token
-            self.lexer.at_line_start = at_line_start
-
-    def _indentation_filter(self, tokens):
-        # A stack of indentation levels; will never pop item 0
-        levels = [0]
-        token = None
-        depth = 0
-        prev_was_ws = False
-        for token in tokens:
-            # WS only occurs at the start of the line
-            # There may be WS followed by NEWLINE so
-            # only track the depth here.  Don't indent/dedent
-            # until there's something real.
-            if token.type == "WS":
-                assert depth == 0
-                depth = len(token.value)
-                prev_was_ws = True
-                # WS tokens are never passed to the parser
-                continue
-
-            if token.type == "NEWLINE":
-                depth = 0
-                if prev_was_ws or token.at_line_start:
-                    # ignore blank lines
-                    continue
-                # pass the other cases on through
-                yield token
-                continue
-
-            # then it must be a real token (not WS, not NEWLINE)
-            # which can affect the indentation level
-
-            prev_was_ws = False
-            if token.must_indent:
+            if must_indent:
                 # The current depth must be larger than the previous level
+                depth = self._line_depth(token)
                 if not (depth > levels[-1]):
                     raise IndentationError("expected an indented block")
 
                 levels.append(depth)
-                yield self._new_token("INDENT", token.lineno, token.pos)
+                tokens.append(self._new_token("INDENT", token.lineno, token.pos))
 
-            elif token.at_line_start:
+            elif line_start:
                 # Must be on the same level or one of the previous levels
+                depth = self._line_depth(token)
                 if depth == levels[-1]:
                     # At the same level
                     pass
@@ -100,33 +88,34 @@ class QuarkLexer:
                     except ValueError:
                         raise IndentationError("inconsistent indentation")
                     for _ in range(i + 1, len(levels)):
-                        yield self._new_token("DEDENT", token.lineno, token.pos)
+                        tokens.append(
+                            self._new_token("DEDENT", token.lineno, token.pos)
+                        )
                         levels.pop()
 
-            yield token
+            tokens.append(token)
 
         # Must dedent any remaining levels
         if len(levels) > 1:
             assert token is not None
             for _ in range(1, len(levels)):
-                yield self._new_token("DEDENT", token.lineno, token.pos)
-
-    def _indent_filter(self, add_endmarker=True):
-        token = None
-        tokens = iter(self.lexer.token, None)
-        tokens = self._track_tokens_filter(tokens)
-        for token in self._indentation_filter(tokens):
-            yield token
+                tokens.append(self._new_token("DEDENT", token.lineno, token.pos))
 
         if add_endmarker:
-            yield self._new_token(
-                "EOF", *(token.lineno, token.pos) if token else (1, 0)
+            tokens.append(
+                self._new_token(
+                    "EOF", *(tokens[-1].lineno, tokens[-1].pos) if tokens else (1, 0)
+                )
             )
 
+        return tokens
+
     def input(self, source, add_endmarker=True):
         self.lexer.paren_count = 0
         self.lexer.input(source)
-        self.token_stream = self._indent_filter(add_endmarker)
+        with gc_paused():
+            self.tokens = self._build_tokens(add_endmarker)
+        self.token_stream = iter(self.tokens)
 
     def token(self):
         try:
@@ -1,25 +1,47 @@
+import logging
 from core.expr_parser import ExprParser
 from .helper_types import NodeType, TreeNode
+from .gc_utils import gc_paused
+
+log = logging.getLogger(__name__)
+
+_TERM_TYPES = frozenset(("ID", "INT", "FLOAT", "STR"))
+_ARGUMENTS_END = frozenset(("COLON", "NEWLINE"))
+# Single-token arguments that ExprParser would turn into a leaf anyway
+_LEAF_ARGUMENT_TYPES = frozenset(("ID", "INT", "FLOAT"))
+# Tokens that can follow such an argument
+_ARGUMENT_SEPARATORS = frozenset(("COMMA", "COLON", "NEWLINE"))
 
 
 class QuarkParser:
     def __init__(self, token_stream):
         self.tree = None
-        self.tokens = list(token_stream)
+        # A list (e.g. QuarkLexer.tokens) is walked in place, not copied
+        self.tokens = (
+            token_stream if isinstance(token_stream, list) else list(token_stream)
+        )
+        self.pos = 0
         self.expr_parser = ExprParser(self)
-        self.prev, self.cur = None, self.tokens[0]
 
     # Util functions
+    @property
+    def cur(self):
+        return self.tokens[self.pos]
+
+    @property
+    def prev(self):
+        return self.tokens[self.pos - 1] if self.pos > 0 else None
+
     def peek(self, index=1):
+        index += self.pos
         return self.tokens[index] if index < len(self.tokens) else None
 
     def consume(self):
-        self.prev = self.tokens.pop(0)
-        self.cur = self.tokens[0]
-        return self.prev
+        self.pos += 1
+        return self.tokens[self.pos - 1]
 
     def is_term(self, token):
-        return token.type in ["ID", "INT", "FLOAT", "STR"]
+        return token.type in _TERM_TYPES
 
     def expect(self, type):
         if self.cur.type == type:
@@ -29,78 +51,83 @@ class QuarkParser:
 
     # Parsing functions
     def block(self):
-        print(f"Block: {self.cur}")
+        log.debug("Block: %s", self.cur)
         node = TreeNode(NodeType.Block)
 
         if self.cur.type == "NEWLINE" and self.peek().type == "INDENT":
             pass
         else:
             while self.cur.type != "NEWLINE":
-                node.children.append(self.statement())
+                node.add(self.statement())
             self.expect("NEWLINE")
 
         return node
 
     def statement(self):
-        print(f"Statement: {self.cur}")
-        node = None
+        log.debug("Statement: %s", self.cur)
+        rule = self.statement_rules.get(self.cur.type)
+        if rule:
+            return rule(self)
 
-        if self.cur.type == "IF":
-            node = self.ifelse()
-        elif "FN" in [self.cur.type, self.peek(2).type]:
-            node = self.function()
-        elif self.cur.type == "AT":
-            self.consume()
-            node = self.function_call()
-        else:
-            node = self.expression()
+        lookahead = self.peek(2)
+        if lookahead and lookahead.type == "FN":
+            return self.function()
 
-        return node
+        return self.expression()
 
     def expression(self):
-        print(f"Expression: {self.cur}")
+        log.debug("Expression: %s", self.cur)
         return self.expr_parser.parse()
 
     def function(self):
-        print(f"Function: {self.cur}")
+        log.debug("Function: %s", self.cur)
         node = None
 
         if self.cur.type == "FN":
             node = TreeNode(NodeType.Function, self.consume())
-            node.children.extend(
-                [TreeNode(NodeType.Identifier, self.expect("ID")), self.arguments()]
-            )
+            node.add(TreeNode(NodeType.Identifier, self.expect("ID")), self.arguments())
             self.expect("COLON")
-            node.children.append(self.block())
-        elif self.peek(2).type == "FN":
+            node.add(self.block())
+        else:
+            # ID EQUALS FN, already matched by statement()
             id = TreeNode(NodeType.Identifier, self.expect("ID"))
             self.expect("EQUALS")
             node = TreeNode(NodeType.Function, self.consume())
-            node.children.extend([id, self.arguments()])
+            node.add(id, self.arguments())
             self.expect("COLON")
-            node.children.append(self.block())
+            node.add(self.block())
 
         return node
 
     def function_call(self):
-        print(f"Function Call: {self.cur}")
-        node = TreeNode(NodeType.FunctionCall)
-        node.children.extend(
-            [TreeNode(NodeType.Identifier, self.expect("ID")), self.arguments()]
-        )
-        return node
+        log.debug("Function Call: %s", self.cur)
+        self.expect("AT")
+        name = TreeNode(NodeType.Identifier, self.expect("ID"))
+        return TreeNode(NodeType.FunctionCall, children=[name, self.arguments()])
 
     def arguments(self):
-        print(f"Arguments: {self.cur}")
+        log.debug("Arguments: %s", self.cur)
         node = TreeNode(NodeType.Arguments)
 
-        while self.cur.type not in ["COLON", "NEWLINE"]:
-            node.children.append(self.expression())
-
-            if self.cur.type == "COMMA":
+        tok_type = self.cur.type
+        while tok_type not in _ARGUMENTS_END:
+            # A lone term is just a leaf, no need to go through the ExprParser
+            nxt = self.peek()
+            if (
+                tok_type in _LEAF_ARGUMENT_TYPES
+                and nxt is not None
+                and nxt.type in _ARGUMENT_SEPARATORS
+            ):
+                node.add(self.term())
+            else:
+                node.add(self.expression())
+
+            tok_type = self.cur.type
+            if tok_type == "COMMA":
                 self.consume()
+                tok_type = self.cur.type
 
-        print(node)
+        log.debug("%s", node)
         return node
 
     def ifelse(self):
@@ -113,5 +140,14 @@ class QuarkParser:
         )
 
     def parse(self):
-        self.tree = TreeNode(NodeType.CompilationUnit)
-        self.tree.children.append(self.block())
+        with gc_paused():
+            self.tree = TreeNode(NodeType.CompilationUnit)
+            self.tree.add(self.block())
+
+    # Statements that can be told apart by their first token. Like
+    # ExprParser.rules, the handlers are stored unbound and built once per class
+    statement_rules = {
+        "IF": ifelse,
+        "FN": function,
+        "AT": function_call,
+    }
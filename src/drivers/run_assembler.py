@@ -1,7 +1,6 @@
 import os
 import argparse
-import ply.lex as lex
-from core.lex_grammar import *
+from pathlib import Path
 from core.helper_types import *
 from core.quark_lexer import QuarkLexer
 from core.quark_parser import QuarkParser
@@ -30,12 +29,12 @@ if __name__ == "__main__":
     args = argp.parse_args()
 
     with open(args.input, "r") as inputf:
-        filenm = args.input[args.input.rfind("/") + 1 : args.input.rfind(".")]
+        filenm = Path(args.input).stem
 
-        lexer = QuarkLexer(lex.lex())
+        lexer = QuarkLexer()
         lexer.input(inputf.read())
 
-        parser = QuarkParser(lexer.token_stream)
+        parser = QuarkParser(lexer.tokens)
         parser.parse()
 
         if not parser.tree:
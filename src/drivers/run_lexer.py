@@ -1,10 +1,8 @@
 import sys
-import ply.lex as lex
-from core.lex_grammar import *
 from core.quark_lexer import QuarkLexer
 
 # Lexer
-lexer = QuarkLexer(lex.lex())
+lexer = QuarkLexer()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import io
 from gvgen import *
 
 
@@ -7,29 +8,29 @@ class TreeViz:
         self.graph.styleDefaultAppend("shape", "rectangle")
 
     def _new(self, tree):
-        val = (
-            (
-                tree.tok.value.replace('"', "").replace(",", "")
-                if type(tree.tok.value) == str
-                else tree.tok.value
-            )
-            if tree.tok
-            else ""
-        )
         return self.graph.newItem(f"{tree}")
 
     def _link(self, node1, node2):
         self.graph.newLink(node1, node2)
 
     def generate(self, tree, parent=None):
-        if tree:
-            node = self._new(tree) if not parent else parent
-            for child in tree.children:
-                if child:
-                    node1 = self._new(child)
-                    self._link(node, node1)
-                    self.generate(child, node1)
+        if not tree:
+            return
+
+        # Children are pushed in reverse so graph items are still created
+        # in pre-order, same as the recursive walk
+        root = parent if parent else self._new(tree)
+        stack = [(child, root) for child in reversed(tree.children)]
+        while stack:
+            child, node = stack.pop()
+            if child:
+                node1 = self._new(child)
+                self._link(node, node1)
+                stack.extend((c, node1) for c in reversed(child.children))
 
     def save(self):
-        outf = open("treeviz.dot", "w+")
-        self.graph.dot(outf)
+        # gvgen writes the graph piecemeal, so collect it and write once
+        buf = io.StringIO()
+        self.graph.dot(buf)
+        with open("treeviz.dot", "w") as outf:
+            outf.write(buf.getvalue())